@@ -17,6 +17,7 @@ tests_require = [
     "xxhash",
     "pandas",
     "awkward1",
+    "numba",
     "boost_histogram",
     "hist>=2.0.0a1",
 ]
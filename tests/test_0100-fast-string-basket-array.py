@@ -0,0 +1,168 @@
+# BSD 3-Clause License; see https://github.com/scikit-hep/uproot4/blob/master/LICENSE
+
+from __future__ import absolute_import
+
+import pickle
+import struct
+
+import numpy
+import pytest
+import skhep_testdata
+
+import uproot4
+import uproot4.interpretation.library
+import uproot4.interpretation.strings
+
+
+strings = [b"", b"one", b"two", b"x" * 254, b"y" * 255, b"z" * 300, b"", b"end"]
+
+
+def serialize(strings, length_bytes, header_bytes=0):
+    entries = []
+    for x in strings:
+        if length_bytes == "4":
+            size = struct.pack(">I", len(x))
+        elif len(x) < 255:
+            size = struct.pack(">B", len(x))
+        else:
+            size = struct.pack(">BI", 255, len(x))
+        entries.append(b"\x00" * header_bytes + size + x)
+    byte_offsets = numpy.cumsum([0] + [len(x) for x in entries]).astype(numpy.int32)
+    data = numpy.frombuffer(b"".join(entries), dtype=numpy.uint8)
+    return data, byte_offsets
+
+
+class FakeFile(object):
+    file_path = "fake.root"
+
+
+class FakeBranch(object):
+    file = FakeFile()
+
+
+class FakeBasket(object):
+    def __init__(self, num_entries):
+        self.num_entries = num_entries
+
+
+@pytest.fixture(params=["python", "compiled"])
+def kernel_mode(request, monkeypatch):
+    if request.param == "compiled":
+        pytest.importorskip("numba")
+    else:
+        monkeypatch.setattr(
+            uproot4.interpretation.strings, "_kernel", lambda function: function
+        )
+    return request.param
+
+
+def basket_array(interpretation, data, byte_offsets, basket=None):
+    library = uproot4.interpretation.library._regularize_library("np")
+    return interpretation.basket_array(
+        data, byte_offsets, basket, FakeBranch(), {}, 0, library
+    )
+
+
+@pytest.mark.parametrize("length_bytes", ["1-5", "4"])
+def test_without_byte_offsets(length_bytes, kernel_mode):
+    interpretation = uproot4.AsStrings(length_bytes=length_bytes)
+    data, byte_offsets = serialize(strings, length_bytes)
+    output = basket_array(interpretation, data, None)
+    assert [x.encode() for x in output] == strings
+
+
+@pytest.mark.parametrize("length_bytes", ["1-5", "4"])
+def test_truncated(length_bytes, kernel_mode):
+    interpretation = uproot4.AsStrings(length_bytes=length_bytes)
+    data, byte_offsets = serialize(strings, length_bytes)
+    for stop in (len(data) - 1, byte_offsets[5] + 2):
+        with pytest.raises(uproot4.deserialization.DeserializationError):
+            basket_array(interpretation, data[:stop], None)
+
+
+def test_num_entries_hint(kernel_mode):
+    interpretation = uproot4.AsStrings()
+    data, byte_offsets = serialize(strings, "1-5")
+    for num_entries in (len(strings), 3, 0):
+        output = basket_array(interpretation, data, None, FakeBasket(num_entries))
+        assert [x.encode() for x in output] == strings
+
+
+@pytest.mark.parametrize("length_bytes", ["1-5", "4"])
+def test_with_byte_offsets(length_bytes):
+    interpretation = uproot4.AsStrings(header_bytes=6, length_bytes=length_bytes)
+    data, byte_offsets = serialize(strings, length_bytes, header_bytes=6)
+    output = basket_array(interpretation, data, byte_offsets)
+    assert [x.encode() for x in output] == strings
+
+
+@pytest.mark.parametrize("length_bytes", ["1-5", "4"])
+def test_with_byte_offsets_uniform(length_bytes):
+    same = [b"evt-000", b"evt-001", b"evt-002"]
+    interpretation = uproot4.AsStrings(header_bytes=6, length_bytes=length_bytes)
+    data, byte_offsets = serialize(same, length_bytes, header_bytes=6)
+    output = basket_array(interpretation, data, byte_offsets)
+    assert [x.encode() for x in output] == same
+    assert output.offsets.tolist() == [0, 7, 14, 21]
+
+
+@pytest.mark.parametrize("length_bytes", ["1-5", "4"])
+def test_with_byte_offsets_long(length_bytes):
+    # long, unequal strings exercise the mask compaction well past one byte
+    # of length header each
+    long = [b"abcdefghij"[i % 10 : i % 10 + 1] * (200 + 37 * i) for i in range(40)]
+    interpretation = uproot4.AsStrings(header_bytes=6, length_bytes=length_bytes)
+    data, byte_offsets = serialize(long, length_bytes, header_bytes=6)
+    output = basket_array(interpretation, data, byte_offsets)
+    assert [x.encode() for x in output] == long
+    assert output.content.tobytes() == b"".join(long)
+
+
+def test_bytes_data():
+    interpretation = uproot4.AsStrings()
+    data, byte_offsets = serialize(strings, "1-5")
+    output = basket_array(interpretation, data.tobytes(), None)
+    assert [x.encode() for x in output] == strings
+    assert output.tobytes() == b"".join(strings)
+
+
+def test_final_array_entry_ranges():
+    with uproot4.open(
+        skhep_testdata.data_path("uproot-sample-6.20.04-uncompressed.root")
+    )["sample/str"] as branch:
+        expected = ["hey-{0}".format(i) for i in range(30)]
+        boundaries = branch.entry_offsets
+        for entry_start in range(0, 30, 3):
+            for entry_stop in list(range(entry_start, 31, 4)) + boundaries:
+                if entry_start < entry_stop:
+                    result = branch.array(
+                        entry_start=entry_start, entry_stop=entry_stop, library="np"
+                    )
+                    assert result.tolist() == expected[entry_start:entry_stop]
+
+        assert branch.array(entry_start=5, entry_stop=5, library="np").tolist() == []
+
+        assert branch.basket(1).array(library="np").tolist() == expected[6:11]
+
+
+def test_iterate_non_ascii():
+    interpretation = uproot4.AsStrings()
+    for data in ([b"abc", b"d"], [b"abc", u"\u00e9t\u00e9".encode("utf-8"), b""]):
+        serialized, byte_offsets = serialize(data, "1-5")
+        output = basket_array(interpretation, serialized, None)
+        assert list(output) == [x.decode("utf-8") for x in data]
+        assert [output[i] for i in range(len(output))] == list(output)
+
+
+def test_specialized_by_length_bytes():
+    for length_bytes in ("1-5", "4"):
+        interpretation = uproot4.AsStrings(header_bytes=6, length_bytes=length_bytes)
+        assert isinstance(interpretation, uproot4.AsStrings)
+        assert interpretation == uproot4.AsStrings(6, length_bytes)
+        assert interpretation.cache_key == "AsStrings(6,{0})".format(
+            repr(length_bytes)
+        )
+        assert pickle.loads(pickle.dumps(interpretation)) == interpretation
+
+    with pytest.raises(ValueError):
+        uproot4.AsStrings(length_bytes="2")
@@ -69,6 +69,26 @@ or
         return cupy
 
 
+def numba():
+    """
+    Imports and returns ``numba``.
+    """
+    try:
+        import numba
+    except ImportError:
+        raise ImportError(
+            """install the 'numba' package with:
+
+    pip install numba
+
+or
+
+    conda install numba"""
+        )
+    else:
+        return numba
+
+
 def XRootD_client():
     """
     Imports and returns ``XRootD.client`` (after setting the
@@ -435,8 +435,7 @@ class Awkward(Library):
 
         elif isinstance(array, uproot4.interpretation.strings.StringArray):
             content = awkward1.layout.NumpyArray(
-                numpy.frombuffer(array.content, dtype=numpy.dtype(numpy.uint8)),
-                parameters={"__array__": "char"},
+                array.content, parameters={"__array__": "char"}
             )
             if issubclass(array.offsets.dtype.type, numpy.int32):
                 offsets = awkward1.layout.Index32(array.offsets)
@@ -15,14 +15,133 @@ an array is being built from ``TBaskets``. Its final form is determined by
 
 from __future__ import absolute_import
 
-import struct
-
 import numpy
 
 import uproot4.interpretation
+import uproot4.extras
+import uproot4.deserialization
+import uproot4._util
+
+
+def _parse_1_5(data, counts, outdata):
+    """
+    Copies each string's payload from ``data`` into ``outdata`` and its size
+    into ``counts``, where each string has a 1-byte length (or 255 followed by
+    a 4-byte big-endian length), and returns the number of entries and the
+    number of bytes written. If the data are truncated, returns ``-1`` and the
+    position at which they were found to be truncated; if there are more
+    entries than ``counts`` can hold, returns ``-2`` and the position.
+    """
+    pos = 0
+    len_outdata = 0
+    entry_num = 0
+    while pos < len(data):
+        size = int(data[pos])
+        pos += 1
+        if size == 255:
+            if pos + 4 > len(data):
+                return -1, pos
+            size = (
+                (int(data[pos]) << 24)
+                | (int(data[pos + 1]) << 16)
+                | (int(data[pos + 2]) << 8)
+                | int(data[pos + 3])
+            )
+            pos += 4
+        if pos + size > len(data):
+            return -1, pos
+        if entry_num == len(counts):
+            return -2, pos
+        counts[entry_num] = size
+        entry_num += 1
+        outdata[len_outdata : len_outdata + size] = data[pos : pos + size]
+        len_outdata += size
+        pos += size
+    return entry_num, len_outdata
+
+
+def _parse_4(data, counts, outdata):
+    """
+    Like ``_parse_1_5``, but every length is a 4-byte big-endian integer.
+    """
+    pos = 0
+    len_outdata = 0
+    entry_num = 0
+    while pos < len(data):
+        if pos + 4 > len(data):
+            return -1, pos
+        size = (
+            (int(data[pos]) << 24)
+            | (int(data[pos + 1]) << 16)
+            | (int(data[pos + 2]) << 8)
+            | int(data[pos + 3])
+        )
+        pos += 4
+        if pos + size > len(data):
+            return -1, pos
+        if entry_num == len(counts):
+            return -2, pos
+        counts[entry_num] = size
+        entry_num += 1
+        outdata[len_outdata : len_outdata + size] = data[pos : pos + size]
+        len_outdata += size
+        pos += size
+    return entry_num, len_outdata
+
+
+def _header_size_1_5(data, byte_starts):
+    """
+    Returns the size of each "1-5" length header: 1 byte, or 5 if the first
+    byte is 255.
+    """
+    is_long = data[byte_starts] == 255
+    return is_long.astype(numpy.int32) * 4 + 1
+
+
+def _header_size_4(data, byte_starts):
+    """
+    Returns the size of each "4" length header, which is always 4 bytes.
+    """
+    return numpy.full(len(byte_starts), 4, dtype=numpy.int32)
+
+
+def _compact(data, byte_starts, byte_stops):
+    """
+    Returns the bytes of ``data`` from each ``byte_starts[i]`` to
+    ``byte_stops[i]`` as one contiguous array.
+
+    Every entry has at least one length byte between its predecessor's stop
+    and its own start, so the ``byte_stops`` are unique and a plain indexed
+    subtraction (rather than ``numpy.add.at``) is enough to mark them.
+    """
+    mask = numpy.zeros(len(data), dtype=numpy.int8)
+    mask[byte_starts[byte_starts < len(data)]] = 1
+    mask[byte_stops[byte_stops < len(data)]] -= 1
+    numpy.cumsum(mask, out=mask)
+    return data[mask.view(numpy.bool_)]
 
 
-_string_4byte_size = struct.Struct(">I")
+_compiled_kernels = {}
+
+
+def _kernel(function):
+    """
+    Returns ``function`` compiled by Numba if Numba can be imported, otherwise
+    the pure Python ``function`` itself. Compilation happens only once.
+
+    Compiled kernels release the GIL, so baskets decoded by a multithreaded
+    ``interpretation_executor`` run in parallel.
+    """
+    compiled = _compiled_kernels.get(function)
+    if compiled is None:
+        try:
+            numba = uproot4.extras.numba()
+        except ImportError:
+            compiled = function
+        else:
+            compiled = numba.njit(cache=True, nogil=True)(function)
+        _compiled_kernels[function] = compiled
+    return compiled
 
 
 class AsStrings(uproot4.interpretation.Interpretation):
@@ -58,6 +177,18 @@ class AsStrings(uproot4.interpretation.Interpretation):
     :doc:`uproot4.interpretation.strings.AsStrings`.)
     """
 
+    _cache_key_name = None
+
+    def __new__(
+        cls, header_bytes=0, length_bytes="1-5", typename=None, original=None
+    ):
+        if cls is AsStrings:
+            if length_bytes == "1-5":
+                cls = _AsStrings_1_5
+            elif length_bytes == "4":
+                cls = _AsStrings_4
+        return super(AsStrings, cls).__new__(cls)
+
     def __init__(
         self, header_bytes=0, length_bytes="1-5", typename=None, original=None
     ):
@@ -139,10 +270,30 @@ class AsStrings(uproot4.interpretation.Interpretation):
 
     @property
     def cache_key(self):
+        if self._cache_key_name is None:
+            name = type(self).__name__
+        else:
+            name = self._cache_key_name
         return "{0}({1},{2})".format(
-            type(self).__name__, self._header_bytes, repr(self._length_bytes)
+            name, self._header_bytes, repr(self._length_bytes)
         )
 
+    def _length_parser(self):
+        if self._length_bytes == "1-5":
+            return _kernel(_parse_1_5)
+        elif self._length_bytes == "4":
+            return _kernel(_parse_4)
+        else:
+            raise AssertionError(repr(self._length_bytes))
+
+    def _length_header_size(self, data, byte_starts):
+        if self._length_bytes == "1-5":
+            return _header_size_1_5(data, byte_starts)
+        elif self._length_bytes == "4":
+            return _header_size_4(data, byte_starts)
+        else:
+            raise AssertionError(repr(self._length_bytes))
+
     def basket_array(
         self, data, byte_offsets, basket, branch, context, cursor_offset, library
     ):
@@ -156,76 +307,67 @@ class AsStrings(uproot4.interpretation.Interpretation):
             library=library,
         )
 
+        if not isinstance(data, numpy.ndarray) or data.dtype != numpy.uint8:
+            data = numpy.frombuffer(data, dtype=numpy.uint8)
+
         if byte_offsets is None:
-            counts = numpy.empty(len(data), dtype=numpy.int32)
-            outdata = numpy.empty(len(data), dtype=data.dtype)
-
-            pos = 0
-            entry_num = 0
-            len_outdata = 0
-
-            if self._length_bytes == "1-5":
-                while True:
-                    if pos >= len(data):
-                        break
-                    size = data[pos]
-                    pos += 1
-                    if size == 255:
-                        (size,) = _string_4byte_size.unpack(data[pos : pos + 4])
-                        pos += 4
-                    counts[entry_num] = size
-                    entry_num += 1
-                    outdata[len_outdata : len_outdata + size] = data[pos : pos + size]
-                    len_outdata += size
-                    pos += size
-
-            elif self._length_bytes == "4":
-                while True:
-                    if pos >= len(data):
-                        break
-                    (size,) = _string_4byte_size.unpack(data[pos : pos + 4])
-                    pos += 4
-                    counts[entry_num] = size
-                    entry_num += 1
-                    outdata[len_outdata : len_outdata + size] = data[pos : pos + size]
-                    len_outdata += size
-                    pos += size
+            parse = self._length_parser()
 
+            if basket is None:
+                num_entries = len(data)
             else:
-                raise AssertionError(repr(self._length_bytes))
+                num_entries = basket.num_entries
+
+            counts = numpy.empty(num_entries, dtype=numpy.int64)
+            outdata = numpy.empty(len(data), dtype=numpy.uint8)
+            entry_num, end = parse(data, counts, outdata)
+
+            if entry_num == -2:
+                # more entries than the TBasket claims: parse them all and let
+                # the caller report the mismatch
+                counts = numpy.empty(len(data), dtype=numpy.int64)
+                entry_num, end = parse(data, counts, outdata)
+
+            if entry_num < 0:
+                raise uproot4.deserialization.DeserializationError(
+                    "string data truncated at byte {0} of {1} in TBasket".format(
+                        end, len(data)
+                    ),
+                    None,
+                    None,
+                    context,
+                    branch.file.file_path,
+                )
 
             counts = counts[:entry_num]
-            data = outdata[:len_outdata]
+            data = outdata[:end]
 
         else:
             byte_starts = byte_offsets[:-1] + self._header_bytes
             byte_stops = byte_offsets[1:]
 
-            if self._length_bytes == "1-5":
-                length_header_size = numpy.ones(len(byte_starts), dtype=numpy.int32)
-                length_header_size[data[byte_starts] == 255] += 4
-            elif self._length_bytes == "4":
-                length_header_size = numpy.full(len(byte_starts), 4, dtype=numpy.int32)
-            else:
-                raise AssertionError(repr(self._length_bytes))
+            length_header_size = self._length_header_size(data, byte_starts)
             byte_starts += length_header_size
 
-            mask = numpy.zeros(len(data), dtype=numpy.int8)
-            mask[byte_starts[byte_starts < len(data)]] = 1
-            numpy.add.at(mask, byte_stops[byte_stops < len(data)], -1)
-            numpy.cumsum(mask, out=mask)
-            data = data[mask.view(numpy.bool_)]
-
             counts = byte_stops - byte_starts
 
-        offsets = numpy.empty(len(counts) + 1, dtype=numpy.int32)
+            if (
+                len(counts) != 0
+                and byte_offsets[0] == 0
+                and byte_offsets[-1] == len(data)
+                and (counts == counts[0]).all()
+                and (length_header_size == length_header_size[0]).all()
+            ):
+                # all entries have the same layout: data is a 2-D table of them
+                skip = self._header_bytes + length_header_size[0]
+                data = data.reshape(len(counts), -1)[:, skip:].reshape(-1)
+            else:
+                data = _compact(data, byte_starts, byte_stops)
+
+        offsets = numpy.empty(len(counts) + 1, dtype=numpy.int64)
         offsets[0] = 0
         numpy.cumsum(counts, out=offsets[1:])
 
-        if hasattr(data, "tobytes"):
-            data = data.tobytes()
-        else:
-            data = data.tostring()
         output = StringArray(offsets, data)
 
         self.hook_after_basket_array(
@@ -253,86 +395,53 @@ class AsStrings(uproot4.interpretation.Interpretation):
             branch=branch,
         )
 
-        basket_offsets = {}
-        basket_content = {}
-        for k, v in basket_arrays.items():
-            basket_offsets[k] = v.offsets
-            basket_content[k] = v.content
+        first_basket = numpy.searchsorted(entry_offsets, entry_start, side="right") - 1
+        stop_basket = numpy.searchsorted(entry_offsets, entry_stop, side="left")
+
+        local_ranges = []
+        length = 0
+        content_length = 0
+        for basket_num in uproot4._util.range(first_basket, stop_basket):
+            start = entry_offsets[basket_num]
+            stop = entry_offsets[basket_num + 1]
+            local_start = max(entry_start, start) - start
+            local_stop = min(entry_stop, stop) - start
+            basket_array = basket_arrays[basket_num]
+            off, cnt = basket_array.offsets, basket_array.content
+            local_ranges.append((off, cnt, local_start, local_stop))
+            length += local_stop - local_start
+            content_length += off[local_stop] - off[local_start]
+
+        # each basket's offsets and content are written once, straight into
+        # the output, while that basket is still in cache
+        offsets = numpy.empty(length + 1, numpy.int64)
+        offsets[0] = 0
+        content = numpy.empty(content_length, numpy.uint8)
+        before = 0
+        entry = 0
+        for off, cnt, local_start, local_stop in local_ranges:
+            num = local_stop - local_start
+            numpy.add(
+                off[local_start + 1 : local_stop + 1],
+                before - off[local_start],
+                out=offsets[entry + 1 : entry + num + 1],
+            )
+            size = off[local_stop] - off[local_start]
+            content[before : before + size] = cnt[off[local_start] : off[local_stop]]
+            before += size
+            entry += num
 
-        if entry_start >= entry_stop:
-            return StringArray(library.zeros((1,), numpy.int64), b"")
+        output = StringArray(offsets, content)
 
-        else:
-            length = 0
-            start = entry_offsets[0]
-            for basket_num, stop in enumerate(entry_offsets[1:]):
-                if start <= entry_start and entry_stop <= stop:
-                    length += entry_stop - entry_start
-                elif start <= entry_start < stop:
-                    length += stop - entry_start
-                elif start <= entry_stop <= stop:
-                    length += entry_stop - start
-                elif entry_start < stop and start <= entry_stop:
-                    length += stop - start
-                start = stop
-
-            offsets = numpy.empty((length + 1,), numpy.int64)
-
-            before = 0
-            start = entry_offsets[0]
-            contents = []
-            for basket_num, stop in enumerate(entry_offsets[1:]):
-                if start <= entry_start and entry_stop <= stop:
-                    local_start = entry_start - start
-                    local_stop = entry_stop - start
-                    off, cnt = basket_offsets[basket_num], basket_content[basket_num]
-                    offsets[:] = (
-                        before - off[local_start] + off[local_start : local_stop + 1]
-                    )
-                    before += off[local_stop] - off[local_start]
-                    contents.append(cnt[off[local_start] : off[local_stop]])
-
-                elif start <= entry_start < stop:
-                    local_start = entry_start - start
-                    local_stop = stop - start
-                    off, cnt = basket_offsets[basket_num], basket_content[basket_num]
-                    offsets[: stop - entry_start + 1] = (
-                        before - off[local_start] + off[local_start : local_stop + 1]
-                    )
-                    before += off[local_stop] - off[local_start]
-                    contents.append(cnt[off[local_start] : off[local_stop]])
-
-                elif start <= entry_stop <= stop:
-                    local_start = 0
-                    local_stop = entry_stop - start
-                    off, cnt = basket_offsets[basket_num], basket_content[basket_num]
-                    offsets[start - entry_start :] = (
-                        before - off[local_start] + off[local_start : local_stop + 1]
-                    )
-                    before += off[local_stop] - off[local_start]
-                    contents.append(cnt[off[local_start] : off[local_stop]])
-
-                elif entry_start < stop and start <= entry_stop:
-                    off, cnt = basket_offsets[basket_num], basket_content[basket_num]
-                    offsets[start - entry_start : stop - entry_start + 1] = (
-                        before - off[0] + off
-                    )
-                    before += off[-1] - off[0]
-                    contents.append(cnt[off[0] : off[-1]])
-
-                start = stop
-
-            output = StringArray(offsets, b"".join(contents))
-
-            self.hook_before_library_finalize(
-                basket_arrays=basket_arrays,
-                entry_start=entry_start,
-                entry_stop=entry_stop,
-                entry_offsets=entry_offsets,
-                library=library,
-                branch=branch,
-                output=output,
-            )
+        self.hook_before_library_finalize(
+            basket_arrays=basket_arrays,
+            entry_start=entry_start,
+            entry_stop=entry_stop,
+            entry_offsets=entry_offsets,
+            library=library,
+            branch=branch,
+            output=output,
+        )
 
         output = library.finalize(output, branch, self, entry_start, entry_stop)
 
@@ -349,14 +458,46 @@ class AsStrings(uproot4.interpretation.Interpretation):
         return output
 
 
+class _AsStrings_1_5(AsStrings):
+    """
+    :doc:`uproot4.interpretation.strings.AsStrings` specialized for
+    ``length_bytes="1-5"``; ``AsStrings(length_bytes="1-5")`` returns one of
+    these.
+    """
+
+    _cache_key_name = "AsStrings"
+
+    def _length_parser(self):
+        return _kernel(_parse_1_5)
+
+    def _length_header_size(self, data, byte_starts):
+        return _header_size_1_5(data, byte_starts)
+
+
+class _AsStrings_4(AsStrings):
+    """
+    :doc:`uproot4.interpretation.strings.AsStrings` specialized for
+    ``length_bytes="4"``; ``AsStrings(length_bytes="4")`` returns one of these.
+    """
+
+    _cache_key_name = "AsStrings"
+
+    def _length_parser(self):
+        return _kernel(_parse_4)
+
+    def _length_header_size(self, data, byte_starts):
+        return _header_size_4(data, byte_starts)
+
+
 class StringArray(object):
     """
     Args:
-        offsets (array of ``numpy.int32``): Starting and stopping indexes for
+        offsets (array of ``numpy.int64``): Starting and stopping indexes for
             each string. The length of the ``offsets`` is one greater than the
             number of strings.
-        content (array): Contiguous array of character data for all strings of
-            the array.
+        content (array of ``numpy.uint8``): Contiguous array of character data
+            for all strings of the array. It is stored as given, without
+            copying.
 
     Temporary array filled by
     :doc:`uproot4.interpretation.strings.AsStrings.basket_array`, which will be
@@ -371,9 +512,9 @@ class StringArray(object):
     def __repr__(self):
         if len(self._content) > 100:
             left, right = self._content[:45], self._content[-45:]
-            content = repr(left) + " ... " + repr(right)
+            content = repr(left.tobytes()) + " ... " + repr(right.tobytes())
         else:
-            content = repr(self._content)
+            content = repr(self._content.tobytes())
         return "StringArray({0}, {1})".format(self._offsets, content)
 
     @property
@@ -387,20 +528,42 @@ class StringArray(object):
     @property
     def content(self):
         """
-        Contiguous array of character data for all strings of the array.
+        Contiguous ``numpy.uint8`` array of character data for all strings of
+        the array.
         """
         return self._content
 
+    def tobytes(self):
+        """
+        The :doc:`uproot4.interpretation.strings.StringArray.content` as
+        ``bytes``, for callers that need an immutable copy.
+        """
+        return self._content.tobytes()
+
     def __getitem__(self, where):
         data = self._content[self._offsets[where] : self._offsets[where + 1]]
-        return uproot4._util.ensure_str(data)
+        return uproot4._util.ensure_str(data.tobytes())
 
     def __len__(self):
         return len(self._offsets) - 1
 
     def __iter__(self):
         start = self._offsets[0]
-        content = self._content
+        content = self.tobytes()
+
+        if not uproot4._util.py2:
+            try:
+                text = content.decode("ascii")
+            except UnicodeDecodeError:
+                pass
+            else:
+                # ASCII bytes and characters correspond one-to-one, so the
+                # offsets index the decoded text directly
+                for stop in self._offsets[1:]:
+                    yield text[start:stop]
+                    start = stop
+                return
+
         for stop in self._offsets[1:]:
             yield uproot4._util.ensure_str(content[start:stop])
             start = stop